@@ -0,0 +1,64 @@
+# molecules.py
+# Imported (not re-executed) on reruns, so the lru_caches and constants below
+# persist for the lifetime of the Streamlit process.
+import math
+from functools import lru_cache
+import numpy as np
+from theme import A_TEAL
+
+_SEG_TMPL  = "M{:.0f} {:.0f}L{:.0f} {:.0f}"
+_PATH_TMPL = '<path d="{}" stroke="{}" stroke-width="{}" stroke-linecap="round" fill="none" />'
+_DOT_TMPL  = '<circle cx="{:.0f}" cy="{:.0f}" r="1.8" fill="#0F172A" />'
+_HEX_UNIT  = np.array([(math.cos(k*math.pi/3), math.sin(k*math.pi/3)) for k in range(6)])
+_HEX_UNIT.flags.writeable = False  # shared by every session in the process
+
+def _segments(x1, y1, x2, y2):
+    return [_SEG_TMPL.format(*p) for p in zip(x1.tolist(), y1.tolist(), x2.tolist(), y2.tolist())]
+
+def _path(segs, w, col):
+    return _PATH_TMPL.format(" ".join(segs), col, w)
+
+def _double_bonds(xs, ys):
+    # inner strokes on edges (0,1), (2,3), (4,5), offset along the edge normal
+    x1, y1, x2, y2 = xs[0::2], ys[0::2], xs[1::2], ys[1::2]
+    dx, dy = x2-x1, y2-y1
+    L = np.hypot(dx, dy)
+    ox, oy = -dy/L*2.0, dx/L*2.0
+    return _segments(x1+ox, y1+oy, x2+ox, y2+oy)
+
+def _substituents(xs, ys, cx, cy, idx, length):
+    # bonds pointing radially outward from the chosen vertices, each ending in a dot
+    x1, y1 = xs[idx], ys[idx]
+    vx, vy = x1-cx, y1-cy
+    L = np.hypot(vx, vy)
+    x3, y3 = x1 + vx/L*length, y1 + vy/L*length
+    dots = [_DOT_TMPL.format(x, y) for x, y in zip(x3.tolist(), y3.tolist())]
+    return _segments(x1, y1, x3, y3), dots
+
+@lru_cache(maxsize=512)
+def molecule_svg(name: str, size: int = 64, stroke="#111827") -> str:
+    rng = np.random.default_rng(hash(name) & 0xFFFFFF)
+    cx, cy = size/2, size/2
+    r = size*0.26
+    rot = rng.uniform(0, math.pi/3)
+
+    c, s = math.cos(rot), math.sin(rot)
+    R = np.array([[c, -s], [s, c]])
+    pts = _HEX_UNIT @ R.T * r + np.array([cx, cy])
+    xs, ys = pts[:, 0], pts[:, 1]
+
+    bg = f'<circle cx="{cx:.1f}" cy="{cy:.1f}" r="{size*0.44:.1f}" fill="{A_TEAL}11" />'
+    edges = _segments(xs, ys, np.roll(xs, -1), np.roll(ys, -1))
+    dbl = _double_bonds(xs, ys)
+
+    n_sub = rng.integers(1, 4)
+    idx = rng.integers(0, 6, size=n_sub)
+    subs, dots = _substituents(xs, ys, cx, cy, idx, size*0.24)
+
+    # one <path> per stroke style keeps the DOM small
+    strokes = _path(edges, 1.8, stroke) + _path(dbl, 1.2, "#1F2937") + _path(subs, 1.5, "#243045")
+    return f'<svg width="{size}" height="{size}" viewBox="0 0 {size} {size}" xmlns="http://www.w3.org/2000/svg">{bg}{strokes}{"".join(dots)}</svg>'
+
+@lru_cache(maxsize=512)
+def svg_card(name: str, size: int = 64) -> str:
+    return f'<div class="molcard">{molecule_svg(name, size=size)}<div class="mollabel">{name}</div></div>'
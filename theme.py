@@ -0,0 +1,33 @@
+# theme.py
+# Imported (not re-executed) on reruns, so the stylesheet is formatted once per process.
+PRIMARY = "#0F172A"
+A_TEAL  = "#27B3B1"
+A_VIO   = "#6B5DD3"
+
+CSS = f"""
+<style>
+#MainMenu {{visibility: hidden;}}
+footer {{visibility: hidden;}}
+html, body, [class*="css"] {{
+  font-family: -apple-system, BlinkMacSystemFont, "Inter", "SF Pro Text", Inter, Roboto, Arial, sans-serif;
+  color: {PRIMARY};
+}}
+h1,h2,h3{{ font-weight:650; letter-spacing:-0.02em; }}
+.section-title {{ font-size:20px; font-weight:600; margin: 0 0 8px 0; }}
+.muted {{ color:#667085; font-size:14px; margin-top:4px; }}
+.divider {{ height:1px; background:#E5E7EB; margin:16px 0 24px 0; }}
+.badges span {{
+  display:inline-block; font-size:12px; background:#F3F4F6; color:#111827;
+  border:1px solid #E5E7EB; border-radius:8px; padding:4px 8px; margin-right:8px;
+}}
+.primary-btn button {{
+  width: 100%;
+  background: linear-gradient(90deg, {A_TEAL} 0%, {A_VIO} 100%) !important;
+  color:#fff !important; border:0 !important; border-radius:10px !important;
+  padding:11px 16px !important; font-weight:600;
+}}
+.molgrid {{ display:grid; grid-template-columns: repeat(6, 1fr); gap: 12px; }}
+.molcard {{ display:flex; flex-direction:column; align-items:center; gap:6px; }}
+.mollabel {{ font-size:12px; color:#475467; text-align:center; }}
+</style>
+"""